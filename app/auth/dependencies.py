@@ -1,32 +1,79 @@
 # app/auth/dependencies.py
 
-from fastapi import Depends, HTTPException, status
+import threading
+from uuid import UUID
+
+from cachetools import TTLCache
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from app.models.user import User
-from app.schemas.user import UserResponse
+from app.schemas.user import UserResponse, user_response_adapter
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
-def get_current_user(
-    db,
-    token: str = Depends(oauth2_scheme)
-) -> UserResponse:
-    """Dependency to get current user from JWT token."""
-    credentials_exception = HTTPException(
+# Recently loaded users keyed by id; holds UserResponse objects, never ORM instances
+_user_cache = TTLCache(maxsize=5000, ttl=30)
+_user_cache_lock = threading.Lock()
+
+def invalidate_user_cache(user_id: UUID) -> None:
+    """Drop a cached user so the next request reloads it from the database."""
+    with _user_cache_lock:
+        _user_cache.pop(user_id, None)
+
+def _credentials_exception() -> HTTPException:
+    """Build the 401 raised whenever the bearer token can't be resolved to a user."""
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
+
+def get_verified_user_id(
+    request: Request,
+    token: str = Depends(oauth2_scheme)
+) -> UUID:
+    """
+    Dependency to verify the JWT token and return the user id.
+
+    FastAPI already runs each Depends() once per request; the id stored on
+    request.state covers direct or nested calls that bypass that cache.
+    """
+    user_id = getattr(request.state, "user_id", None)
+    if user_id is not None:
+        return user_id
+
     user_id = User.verify_token(token)
     if user_id is None:
-        raise credentials_exception
-    
-    user = db.query(User).filter(User.id == user_id).first()
-    if user is None:
-        raise credentials_exception
-        
-    return UserResponse.model_validate(user)  # Updated from from_orm
+        raise _credentials_exception()
+
+    request.state.user_id = user_id
+    return user_id
+
+def get_current_user(
+    db,
+    request: Request,
+    token: str = Depends(oauth2_scheme)
+) -> UserResponse:
+    """Dependency to get current user from JWT token."""
+    current_user = getattr(request.state, "user", None)
+    if current_user is not None:
+        return current_user
+
+    user_id = get_verified_user_id(request, token)
+
+    with _user_cache_lock:
+        user_response = _user_cache.get(user_id)
+    if user_response is None:
+        user = db.get(User, user_id)
+        if user is None:
+            raise _credentials_exception()
+
+        user_response = user_response_adapter.validate_python(user, from_attributes=True)
+        with _user_cache_lock:
+            _user_cache[user_id] = user_response
+
+    request.state.user = user_response
+    return user_response
 
 def get_current_active_user(
     current_user: UserResponse = Depends(get_current_user)
@@ -1,11 +1,43 @@
 # app/database.py
 
-from sqlalchemy import create_engine
+from functools import lru_cache
+from typing import Optional
+
+from sqlalchemy import create_engine, make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.pool import QueuePool
 
 from .config import settings
 
+def _engine_options(database_url: str) -> dict:
+    """
+    Return the pool and logging options shared by the sync and async engines.
+
+    Pool sizing options are only included when the URL's default pool is a QueuePool
+    (e.g. Postgres); SQLite's SingletonThreadPool/NullPool reject them.
+
+    Args:
+        database_url (str): The database connection URL the engine will use.
+
+    Returns:
+        dict: Keyword arguments for create_engine/create_async_engine.
+    """
+    options = {
+        "pool_recycle": settings.DB_POOL_RECYCLE,  # Replace connections before the server drops them
+        "pool_pre_ping": True,  # Discard dead connections at checkout instead of failing the request
+        "query_cache_size": settings.DB_QUERY_CACHE_SIZE,
+        "echo": settings.DB_ECHO,  # Set DB_ECHO=true to log SQL queries while debugging
+    }
+    url = make_url(database_url)
+    if issubclass(url.get_dialect().get_pool_class(url), QueuePool):
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+    return options
+
 def get_engine(database_url: str = settings.DATABASE_URL):
     """
     Create and return a new SQLAlchemy engine.
@@ -17,8 +49,7 @@ def get_engine(database_url: str = settings.DATABASE_URL):
         Engine: A new SQLAlchemy Engine instance.
     """
     try:
-        # Create an engine instance with echo=True to log SQL queries (useful for learning)
-        engine = create_engine(database_url, echo=True)
+        engine = create_engine(database_url, **_engine_options(database_url))
         return engine
     except SQLAlchemyError as e:
         print(f"Error creating engine: {e}")
@@ -40,10 +71,80 @@ def get_sessionmaker(engine):
         bind=engine        # Bind the sessionmaker to the provided engine
     )
 
+def get_async_database_url(database_url: str = settings.DATABASE_URL) -> str:
+    """
+    Build the async connection URL for the given database URL.
+
+    Args:
+        database_url (str): The sync database connection URL.
+
+    Returns:
+        str: settings.ASYNC_DATABASE_URL if set, otherwise the URL with the asyncpg driver.
+    """
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    url = make_url(database_url)
+    if url.get_backend_name() == "postgresql":
+        url = url.set(drivername="postgresql+asyncpg")
+    return url.render_as_string(hide_password=False)
+
+def get_async_engine(database_url: Optional[str] = None):
+    """
+    Create and return a new SQLAlchemy async engine.
+
+    Args:
+        database_url (str, optional): The async database connection URL.
+            Defaults to the URL from get_async_database_url().
+
+    Returns:
+        AsyncEngine: A new SQLAlchemy AsyncEngine instance.
+    """
+    # Imported on use so importing app.database doesn't load the asyncio layer and driver
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    database_url = database_url or get_async_database_url()
+    try:
+        return create_async_engine(database_url, **_engine_options(database_url))
+    except SQLAlchemyError as e:
+        print(f"Error creating async engine: {e}")
+        raise
+
+def get_async_sessionmaker(engine):
+    """
+    Create and return a new async sessionmaker.
+
+    Args:
+        engine (AsyncEngine): The SQLAlchemy AsyncEngine to bind the sessionmaker to.
+
+    Returns:
+        async_sessionmaker: A configured async session factory.
+    """
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+    return async_sessionmaker(
+        bind=engine,
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False  # Keep attributes loaded after commit; lazy loads can't run outside await
+    )
+
 # Initialize engine and SessionLocal using the factory functions
 engine = get_engine()
 SessionLocal = get_sessionmaker(engine)
 
+@lru_cache(maxsize=None)
+def get_async_session_factory():
+    """
+    Return the process-wide async sessionmaker, creating its engine on first use.
+
+    The async engine is built lazily so that importing this module never requires
+    an async driver; only code that actually uses get_async_db pays for it.
+
+    Returns:
+        async_sessionmaker: The shared async session factory.
+    """
+    return get_async_sessionmaker(get_async_engine())
+
 # Base declarative class that our models will inherit from
 Base = declarative_base()
 
@@ -62,3 +163,16 @@ def get_db():
         yield db  # Provide the session to the caller
     finally:
         db.close()  # Ensure the session is closed after use
+
+async def get_async_db():
+    """
+    Dependency function that provides an async database session.
+
+    Use this in async route handlers so queries await the driver instead of
+    blocking the event loop.
+
+    Yields:
+        AsyncSession: A SQLAlchemy AsyncSession instance.
+    """
+    async with get_async_session_factory()() as db:
+        yield db
@@ -1,27 +1,41 @@
 # app/models/user.py
 from datetime import datetime, timedelta
+import hashlib
+import threading
+import time
 import uuid
 from typing import Optional, Dict, Any
 
-from sqlalchemy import Column, String, DateTime, Boolean
+from sqlalchemy import Column, String, DateTime, Boolean, select, union_all
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import declarative_base
 from sqlalchemy.exc import IntegrityError
-from passlib.context import CryptContext
-from jose import JWTError, jwt
+from cachetools import TTLCache
+import bcrypt
+import jwt
+from jwt import InvalidTokenError as JWTError
 from pydantic import ValidationError
 
+from app.config import settings
+from app.database import Base
 from app.schemas.base import UserCreate
-from app.schemas.user import UserResponse, Token
 
-Base = declarative_base()
+# Signing key encoded once so the HMAC path gets bytes without a per-call str.encode()
+_SECRET_BYTES = settings.SECRET_KEY.encode()
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Default token lifetime in seconds
+_ACCESS_TOKEN_LIFETIME = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
 
-# Move to config
-SECRET_KEY = "your-secret-key"
-ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 30
+# Decode arguments are fixed for the process, so build them once instead of per call
+_DECODE_KWARGS = {
+    "key": _SECRET_BYTES,
+    "algorithms": (settings.ALGORITHM,),
+    "options": {"require": ["sub", "exp"], "verify_aud": False},
+}
+
+# Verified tokens, keyed by a truncated SHA-256 digest so raw tokens are never stored.
+# Values are (user_id, exp) tuples; entries are dropped after the TTL or once exp passes.
+_token_cache = TTLCache(maxsize=10000, ttl=5)
+_token_cache_lock = threading.Lock()
 
 class User(Base):
     __tablename__ = 'users'
@@ -44,30 +58,68 @@ class User(Base):
     @staticmethod
     def hash_password(password: str) -> str:
         """Hash a password using bcrypt."""
-        return pwd_context.hash(password)
+        return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)).decode()
 
     def verify_password(self, plain_password: str) -> bool:
         """Verify a plain password against the hashed password."""
-        return pwd_context.verify(plain_password, self.password)
+        return bcrypt.checkpw(plain_password.encode(), self.password.encode())
+
+    def password_needs_rehash(self) -> bool:
+        """Check whether the stored hash uses a different bcrypt cost than configured."""
+        return int(self.password.split("$")[2]) != settings.BCRYPT_ROUNDS
+
+    @staticmethod
+    async def hash_password_async(password: str) -> str:
+        """Hash a password in a worker thread so the event loop is not blocked."""
+        # Imported here: pulling in FastAPI dominates this module's import time otherwise
+        from fastapi.concurrency import run_in_threadpool
+        return await run_in_threadpool(User.hash_password, password)
+
+    async def verify_password_async(self, plain_password: str) -> bool:
+        """Verify a password in a worker thread so the event loop is not blocked."""
+        from fastapi.concurrency import run_in_threadpool
+        return await run_in_threadpool(self.verify_password, plain_password)
 
     @staticmethod
     def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
         """Create a JWT access token."""
         to_encode = data.copy()
-        expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
-        to_encode.update({"exp": expire})
-        return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+        # exp is a NumericDate (RFC 7519), so plain epoch seconds avoid datetime arithmetic
+        lifetime = expires_delta.total_seconds() if expires_delta else _ACCESS_TOKEN_LIFETIME
+        to_encode["exp"] = int(time.time() + lifetime)
+        return jwt.encode(to_encode, _SECRET_BYTES, algorithm=settings.ALGORITHM)
 
     @staticmethod
     def verify_token(token: str) -> Optional[UUID]:
-        """Verify and decode a JWT token."""
+        """Verify and decode a JWT token, reusing recent verifications."""
+        key = hashlib.sha256(token.encode()).digest()[:16]
+        with _token_cache_lock:
+            cached = _token_cache.get(key)
+            if cached is not None:
+                user_id, exp = cached
+                if time.time() <= exp:
+                    return user_id
+                del _token_cache[key]
+
         try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-            user_id = payload.get("sub")
-            return uuid.UUID(user_id) if user_id else None
+            payload = jwt.decode(token, **_DECODE_KWARGS)
+            user_id = uuid.UUID(payload["sub"])
         except (JWTError, ValueError):
             return None
 
+        with _token_cache_lock:
+            _token_cache[key] = (user_id, payload["exp"])
+        return user_id
+
+    @classmethod
+    def find_by_username_or_email(cls, db, username: str, email: str) -> Optional["User"]:
+        """Find a user by username or email using one index scan per column."""
+        stmt = union_all(
+            select(cls).where(cls.username == username),
+            select(cls).where(cls.email == email),
+        )
+        return db.execute(select(cls).from_statement(stmt)).scalars().first()
+
     @classmethod
     def register(cls, db, user_data: Dict[str, Any]) -> "User":
         """Register a new user with validation."""
@@ -78,10 +130,9 @@ class User(Base):
                 raise ValueError("Password must be at least 6 characters long")
             
             # Check if email/username exists
-            existing_user = db.query(cls).filter(
-                (cls.email == user_data.get('email')) |
-                (cls.username == user_data.get('username'))
-            ).first()
+            existing_user = cls.find_by_username_or_email(
+                db, user_data.get('username'), user_data.get('email')
+            )
             
             if existing_user:
                 raise ValueError("Username or email already exists")
@@ -112,22 +163,29 @@ class User(Base):
     @classmethod
     def authenticate(cls, db, username: str, password: str) -> Optional[Dict[str, Any]]:
         """Authenticate user and return token with user data."""
-        user = db.query(cls).filter(
-            (cls.username == username) | (cls.email == username)
-        ).first()
+        user = cls.find_by_username_or_email(db, username, username)
 
         if not user or not user.verify_password(password):
             return None # pragma: no cover
 
+        if user.password_needs_rehash():
+            user.password = cls.hash_password(password)
         user.last_login = datetime.utcnow()
         db.commit()
 
-        # Create token response using Pydantic models
-        user_response = UserResponse.model_validate(user)
-        token_response = Token(
-            access_token=cls.create_access_token({"sub": str(user.id)}),
-            token_type="bearer",
-            user=user_response
-        )
-
-        return token_response.model_dump()
\ No newline at end of file
+        # Build the Token-shaped dict directly; response models validate it at the route boundary
+        return {
+            "access_token": cls.create_access_token({"sub": str(user.id)}),
+            "token_type": "bearer",
+            "user": {
+                "id": user.id,
+                "username": user.username,
+                "email": user.email,
+                "first_name": user.first_name,
+                "last_name": user.last_name,
+                "is_active": user.is_active,
+                "is_verified": user.is_verified,
+                "created_at": user.created_at,
+                "updated_at": user.updated_at,
+            },
+        }
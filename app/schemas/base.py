@@ -26,11 +26,22 @@ class PasswordMixin(BaseModel):
             raise ValidationError("Password is required", model=cls) # pragma: no cover
         if len(password) < 6:
             raise ValueError("Password must be at least 6 characters long")
-        if not any(char.isupper() for char in password):
+        # Single pass over the password, stopping once every character class is seen
+        has_upper = has_lower = has_digit = False
+        for char in password:
+            if char.isupper():
+                has_upper = True
+            elif char.islower():
+                has_lower = True
+            elif char.isdigit():
+                has_digit = True
+            if has_upper and has_lower and has_digit:
+                break
+        if not has_upper:
             raise ValueError("Password must contain at least one uppercase letter")
-        if not any(char.islower() for char in password):
+        if not has_lower:
             raise ValueError("Password must contain at least one lowercase letter")
-        if not any(char.isdigit() for char in password):
+        if not has_digit:
             raise ValueError("Password must contain at least one digit")
         return values
 
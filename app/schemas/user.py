@@ -1,7 +1,7 @@
 from typing import Optional
 from uuid import UUID
 from datetime import datetime
-from pydantic import BaseModel, EmailStr, ConfigDict
+from pydantic import BaseModel, EmailStr, ConfigDict, TypeAdapter
 
 class UserResponse(BaseModel):
     """Schema for user response data"""
@@ -45,6 +45,10 @@ class Token(BaseModel):
     )
 
 
+# Adapter built once at import; validate_python(obj, from_attributes=True) maps ORM objects
+user_response_adapter = TypeAdapter(UserResponse)
+
+
 class TokenData(BaseModel):
     """Schema for JWT token payload"""
     user_id: Optional[UUID] = None
@@ -10,7 +10,7 @@ import pytest
 import requests
 from faker import Faker
 from playwright.sync_api import sync_playwright, Browser, Page
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, insert, text
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 
@@ -140,24 +140,27 @@ def setup_test_database(request):
 def db_session(request) -> Generator[Session, None, None]:
     """
     Provide a test-scoped database session.
-    By default, truncates all tables after each test to ensure isolation,
-    unless --preserve-db is passed.
+    The session runs inside an outer transaction on a dedicated connection, and
+    session.commit()/rollback() only release or roll back SAVEPOINTs within it.
+    By default the outer transaction is rolled back after each test, so no rows
+    are left behind, unless --preserve-db is passed, in which case it is committed.
     """
-    session = TestingSessionLocal()
+    connection = test_engine.connect()
+    transaction = connection.begin()
+    session = TestingSessionLocal(bind=connection, join_transaction_mode="create_savepoint")
     try:
         yield session
     finally:
-        logger.info("db_session teardown: about to truncate tables.")
+        logger.info("db_session teardown: about to end the test transaction.")
+        session.close()
         preserve_db = request.config.getoption("--preserve-db")
         if preserve_db:
-            logger.info("Skipping table truncation due to --preserve-db flag.")
+            logger.info("Committing test transaction due to --preserve-db flag.")
+            transaction.commit()
         else:
-            logger.info("Truncating all tables now.")
-            for table in reversed(Base.metadata.sorted_tables):
-                logger.info(f"Truncating table: {table}")
-                session.execute(table.delete())
-            session.commit()
-        session.close()
+            logger.info("Rolling back test transaction.")
+            transaction.rollback()
+        connection.close()
         logger.info("db_session teardown: done.")
 
 # ======================================================================================
@@ -196,12 +199,11 @@ def seed_users(db_session: Session, request) -> List[User]:
     except AttributeError:
         num_users = 5
 
-    users = []
-    for _ in range(num_users):
-        user_data = create_fake_user()
-        user = User(**user_data)
-        users.append(user)
-        db_session.add(user)
+    # One multi-row INSERT ... RETURNING instead of a unit-of-work flush per user
+    rows = [create_fake_user() for _ in range(num_users)]
+    users = db_session.scalars(
+        insert(User).returning(User, sort_by_parameter_order=True), rows
+    ).all()
 
     db_session.commit()
     logger.info(f"Seeded {len(users)} users into the test database.")
@@ -292,7 +294,7 @@ def pytest_addoption(parser):
         "--preserve-db",
         action="store_true",
         default=False,
-        help="Keep test database after tests, and skip table truncation."
+        help="Keep test database after tests, and commit each test's data instead of rolling it back."
     )
     parser.addoption(
         "--run-slow",
@@ -341,7 +343,7 @@ Basic Examples:
 
 Command Examples:
 - Basic run: pytest
-- Keep database afterward (skip table truncation & drop): pytest --preserve-db
+- Keep database afterward (commit test data & skip drop): pytest --preserve-db
 - Include slow tests: pytest --run-slow
 - Show output: pytest -v -s
 """
@@ -1,12 +1,19 @@
 # tests/auth/test_dependencies.py
 
 import pytest
-from unittest.mock import MagicMock, patch, ANY
-from fastapi import HTTPException, status
-from app.auth.dependencies import get_current_user, get_current_active_user
+from unittest.mock import MagicMock, patch
+from fastapi import Depends, FastAPI, HTTPException, Request, status
+from fastapi.testclient import TestClient
+from app.auth import dependencies
+from app.auth.dependencies import (
+    get_current_user,
+    get_current_active_user,
+    get_verified_user_id,
+    invalidate_user_cache,
+)
 from app.schemas.user import UserResponse
 from app.models.user import User
-from uuid import uuid4
+from uuid import UUID, uuid4
 from datetime import datetime
 
 # Sample user data for testing
@@ -39,6 +46,17 @@ inactive_user = User(
 def mock_db():
     return MagicMock()
 
+# Build a bare request; each call stands in for a separate HTTP request
+def make_request() -> Request:
+    return Request({"type": "http"})
+
+# Fixture for isolating tests from the module-level user cache
+@pytest.fixture(autouse=True)
+def clear_user_cache():
+    dependencies._user_cache.clear()
+    yield
+    dependencies._user_cache.clear()
+
 # Fixture for mocking token verification
 @pytest.fixture
 def mock_verify_token():
@@ -48,9 +66,9 @@ def mock_verify_token():
 # Test get_current_user with valid token and existing user
 def test_get_current_user_valid_token_existing_user(mock_db, mock_verify_token):
     mock_verify_token.return_value = sample_user.id
-    mock_db.query.return_value.filter.return_value.first.return_value = sample_user
+    mock_db.get.return_value = sample_user
 
-    user_response = get_current_user(db=mock_db, token="validtoken")
+    user_response = get_current_user(db=mock_db, request=make_request(), token="validtoken")
 
     assert isinstance(user_response, UserResponse)
     assert user_response.id == sample_user.id
@@ -64,46 +82,113 @@ def test_get_current_user_valid_token_existing_user(mock_db, mock_verify_token):
     assert user_response.updated_at == sample_user.updated_at
 
     mock_verify_token.assert_called_once_with("validtoken")
-    mock_db.query.assert_called_once_with(User)
-    # Use ANY to ignore the specific BinaryExpression instance
-    mock_db.query.return_value.filter.assert_called_once_with(ANY)
-    mock_db.query.return_value.filter.return_value.first.assert_called_once()
+    mock_db.get.assert_called_once_with(User, sample_user.id)
+
+# Test get_current_user serves repeat lookups from the cache
+def test_get_current_user_uses_cache(mock_db, mock_verify_token):
+    mock_verify_token.return_value = sample_user.id
+    mock_db.get.return_value = sample_user
+
+    first = get_current_user(db=mock_db, request=make_request(), token="validtoken")
+    second = get_current_user(db=mock_db, request=make_request(), token="validtoken")
+
+    assert second == first
+    mock_db.get.assert_called_once_with(User, sample_user.id)
+
+# Test invalidate_user_cache forces a fresh database lookup
+def test_invalidate_user_cache(mock_db, mock_verify_token):
+    mock_verify_token.return_value = sample_user.id
+    mock_db.get.return_value = sample_user
+
+    get_current_user(db=mock_db, request=make_request(), token="validtoken")
+    invalidate_user_cache(sample_user.id)
+    get_current_user(db=mock_db, request=make_request(), token="validtoken")
+
+    assert mock_db.get.call_count == 2
+
+# Test get_verified_user_id stores the verified id on request.state
+def test_get_verified_user_id_uses_request_state(mock_verify_token):
+    mock_verify_token.return_value = sample_user.id
+    request = make_request()
+
+    assert get_verified_user_id(request=request, token="validtoken") == sample_user.id
+    assert get_verified_user_id(request=request, token="validtoken") == sample_user.id
+
+    assert request.state.user_id == sample_user.id
+    mock_verify_token.assert_called_once_with("validtoken")
+
+# Test get_verified_user_id with invalid token
+def test_get_verified_user_id_invalid_token(mock_verify_token):
+    mock_verify_token.return_value = None
+
+    with pytest.raises(HTTPException) as exc_info:
+        get_verified_user_id(request=make_request(), token="invalidtoken")
+
+    assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
+
+# Test FastAPI injects the request into get_verified_user_id on a real route
+def test_get_verified_user_id_as_route_dependency(mock_verify_token):
+    mock_verify_token.return_value = sample_user.id
+    app = FastAPI()
+
+    @app.get("/me")
+    def me(request: Request, user_id: UUID = Depends(get_verified_user_id)):
+        return {"user_id": str(user_id), "state": str(request.state.user_id)}
+
+    response = TestClient(app).get("/me", headers={"Authorization": "Bearer validtoken"})
+
+    assert response.status_code == 200
+    assert response.json() == {"user_id": str(sample_user.id), "state": str(sample_user.id)}
+    mock_verify_token.assert_called_once_with("validtoken")
+
+# Test get_current_user reuses the user resolved earlier in the same request
+def test_get_current_user_uses_request_state(mock_db, mock_verify_token):
+    mock_verify_token.return_value = sample_user.id
+    mock_db.get.return_value = sample_user
+    request = make_request()
+
+    first = get_current_user(db=mock_db, request=request, token="validtoken")
+    invalidate_user_cache(sample_user.id)
+    second = get_current_user(db=mock_db, request=request, token="validtoken")
+
+    assert second is first
+    assert request.state.user is first
+    mock_verify_token.assert_called_once_with("validtoken")
+    mock_db.get.assert_called_once_with(User, sample_user.id)
 
 # Test get_current_user with invalid token
 def test_get_current_user_invalid_token(mock_db, mock_verify_token):
     mock_verify_token.return_value = None
 
     with pytest.raises(HTTPException) as exc_info:
-        get_current_user(db=mock_db, token="invalidtoken")
+        get_current_user(db=mock_db, request=make_request(), token="invalidtoken")
 
     assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
     assert exc_info.value.detail == "Could not validate credentials"
 
     mock_verify_token.assert_called_once_with("invalidtoken")
-    mock_db.query.assert_not_called()
+    mock_db.get.assert_not_called()
 
 # Test get_current_user with valid token but non-existent user
 def test_get_current_user_valid_token_nonexistent_user(mock_db, mock_verify_token):
     mock_verify_token.return_value = sample_user.id
-    mock_db.query.return_value.filter.return_value.first.return_value = None
+    mock_db.get.return_value = None
 
     with pytest.raises(HTTPException) as exc_info:
-        get_current_user(db=mock_db, token="validtoken")
+        get_current_user(db=mock_db, request=make_request(), token="validtoken")
 
     assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
     assert exc_info.value.detail == "Could not validate credentials"
 
     mock_verify_token.assert_called_once_with("validtoken")
-    mock_db.query.assert_called_once_with(User)
-    mock_db.query.return_value.filter.assert_called_once_with(ANY)
-    mock_db.query.return_value.filter.return_value.first.assert_called_once()
+    mock_db.get.assert_called_once_with(User, sample_user.id)
 
 # Test get_current_active_user with active user
 def test_get_current_active_user_active(mock_db, mock_verify_token):
     mock_verify_token.return_value = sample_user.id
-    mock_db.query.return_value.filter.return_value.first.return_value = sample_user
+    mock_db.get.return_value = sample_user
 
-    current_user = get_current_user(db=mock_db, token="validtoken")
+    current_user = get_current_user(db=mock_db, request=make_request(), token="validtoken")
     active_user = get_current_active_user(current_user=current_user)
 
     assert isinstance(active_user, UserResponse)
@@ -112,9 +197,9 @@ def test_get_current_active_user_active(mock_db, mock_verify_token):
 # Test get_current_active_user with inactive user
 def test_get_current_active_user_inactive(mock_db, mock_verify_token):
     mock_verify_token.return_value = inactive_user.id
-    mock_db.query.return_value.filter.return_value.first.return_value = inactive_user
+    mock_db.get.return_value = inactive_user
 
-    current_user = get_current_user(db=mock_db, token="validtoken")
+    current_user = get_current_user(db=mock_db, request=make_request(), token="validtoken")
 
     with pytest.raises(HTTPException) as exc_info:
         get_current_active_user(current_user=current_user)
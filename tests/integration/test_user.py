@@ -12,7 +12,7 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import sessionmaker
 
 from app.models.user import User
-from tests.conftest import create_fake_user, managed_db_session
+from tests.conftest import Base, create_fake_user, managed_db_session
 
 # Use the logger configured in conftest.py
 logger = logging.getLogger(__name__)
@@ -25,13 +25,22 @@ def test_database_connection(db_session):
     """
     Verify that the database connection is working.
     
-    Uses the db_session fixture from conftest.py, which truncates tables after each test.
+    Uses the db_session fixture from conftest.py, which rolls back each test's changes.
     """
     result = db_session.execute(text("SELECT 1"))
     assert result.scalar() == 1
     logger.info("Database connection test passed")
 
 
+def test_user_model_uses_shared_base():
+    """
+    Verify that the User model is registered on the Base metadata from app.database,
+    so create_all/drop_all in conftest.py manage the users table.
+    """
+    assert User.__table__.metadata is Base.metadata
+    assert "users" in Base.metadata.tables
+
+
 def test_managed_session():
     """
     Test the managed_db_session context manager for one-off queries and rollbacks.
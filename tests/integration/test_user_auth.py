@@ -1,10 +1,17 @@
 # tests/integration/test_user_auth.py
 
+import asyncio
+import hashlib
+import time
+from datetime import timedelta
 import pytest
-from uuid import UUID
+from unittest.mock import patch
+from uuid import UUID, uuid4
 import pydantic_core
 from sqlalchemy.exc import IntegrityError
+from app.models import user as user_module
 from app.models.user import User
+from app.schemas.user import Token
 
 def test_password_hashing(db_session, fake_user_data):
     """Test password hashing and verification functionality"""
@@ -23,6 +30,21 @@ def test_password_hashing(db_session, fake_user_data):
     assert user.verify_password("WrongPass123") is False
     assert hashed != original_password
 
+def test_password_hashing_async(fake_user_data):
+    """Test the thread-pool hashing and verification helpers"""
+    hashed = asyncio.run(User.hash_password_async("TestPass123"))
+
+    user = User(
+        first_name=fake_user_data['first_name'],
+        last_name=fake_user_data['last_name'],
+        email=fake_user_data['email'],
+        username=fake_user_data['username'],
+        password=hashed
+    )
+
+    assert asyncio.run(user.verify_password_async("TestPass123")) is True
+    assert asyncio.run(user.verify_password_async("WrongPass123")) is False
+
 def test_user_registration(db_session, fake_user_data):
     """Test user registration process"""
     fake_user_data['password'] = "TestPass123"
@@ -87,6 +109,17 @@ def test_user_authentication(db_session, fake_user_data):
     assert auth_result["token_type"] == "bearer"
     assert "user" in auth_result
 
+def test_authentication_result_matches_token_schema(db_session, fake_user_data):
+    """Test that the authentication result has the same shape as a dumped Token"""
+    fake_user_data['password'] = "TestPass123"
+    user = User.register(db_session, fake_user_data)
+    db_session.commit()
+
+    auth_result = User.authenticate(db_session, fake_user_data['username'], "TestPass123")
+
+    assert Token.model_validate(auth_result).model_dump() == auth_result
+    assert auth_result["user"]["id"] == user.id
+
 def test_user_last_login_update(db_session, fake_user_data):
     """Test that last_login is updated on authentication"""
     fake_user_data['password'] = "TestPass123"
@@ -99,6 +132,22 @@ def test_user_last_login_update(db_session, fake_user_data):
     db_session.refresh(user)
     assert user.last_login is not None
 
+def test_authentication_rehashes_on_cost_change(db_session, fake_user_data, monkeypatch):
+    """Test that login rehashes passwords stored with a different bcrypt cost"""
+    monkeypatch.setattr(user_module.settings, "BCRYPT_ROUNDS", 4)
+    fake_user_data['password'] = "TestPass123"
+    user = User.register(db_session, fake_user_data)
+    db_session.commit()
+    assert user.password.startswith("$2b$04$")
+
+    monkeypatch.setattr(user_module.settings, "BCRYPT_ROUNDS", 5)
+    assert user.password_needs_rehash() is True
+    User.authenticate(db_session, fake_user_data['username'], "TestPass123")
+    db_session.refresh(user)
+
+    assert user.password.startswith("$2b$05$")
+    assert user.verify_password("TestPass123") is True
+
 def test_unique_email_username(db_session):
     """Test uniqueness constraints for email and username"""
     # Create first user with specific test data
@@ -160,6 +209,44 @@ def test_token_creation_and_verification(db_session, fake_user_data):
     decoded_user_id = User.verify_token(token)
     assert decoded_user_id == user.id
 
+def test_token_expiry_claim():
+    """Test that tokens carry an integer exp claim honouring expires_delta"""
+    before = int(time.time())
+    token = User.create_access_token({"sub": str(uuid4())}, expires_delta=timedelta(minutes=5))
+    payload = user_module.jwt.decode(token, options={"verify_signature": False})
+
+    assert isinstance(payload["exp"], int)
+    assert before + 300 <= payload["exp"] <= int(time.time()) + 300
+
+def test_token_without_exp_is_rejected():
+    """Test that tokens missing the required exp claim are rejected"""
+    token = user_module.jwt.encode(
+        {"sub": str(uuid4())}, user_module.settings.SECRET_KEY, algorithm=user_module.settings.ALGORITHM
+    )
+    assert User.verify_token(token) is None
+
+def test_verify_token_uses_cache(db_session, fake_user_data):
+    """Test that a verified token is served from the cache on repeat calls"""
+    fake_user_data['password'] = "TestPass123"
+    user = User.register(db_session, fake_user_data)
+    db_session.commit()
+
+    token = User.create_access_token({"sub": str(user.id)})
+    assert User.verify_token(token) == user.id
+
+    with patch("app.models.user.jwt.decode") as mock_decode:
+        assert User.verify_token(token) == user.id
+        mock_decode.assert_not_called()
+
+def test_verify_token_evicts_expired_cache_entry():
+    """Test that a cached token past its exp claim is verified again"""
+    token = "cached.expired.token"
+    key = hashlib.sha256(token.encode()).digest()[:16]
+    user_module._token_cache[key] = (uuid4(), time.time() - 1)
+
+    assert User.verify_token(token) is None
+    assert key not in user_module._token_cache
+
 def test_authenticate_with_email(db_session, fake_user_data):
     """Test authentication using email instead of username"""
     fake_user_data['password'] = "TestPass123"
@@ -176,6 +263,16 @@ def test_authenticate_with_email(db_session, fake_user_data):
     assert auth_result is not None
     assert "access_token" in auth_result
 
+def test_find_by_username_or_email(db_session, fake_user_data):
+    """Test that users can be found by either username or email"""
+    fake_user_data['password'] = "TestPass123"
+    user = User.register(db_session, fake_user_data)
+    db_session.commit()
+
+    assert User.find_by_username_or_email(db_session, fake_user_data['username'], "none@example.com") == user
+    assert User.find_by_username_or_email(db_session, "nobody", fake_user_data['email']) == user
+    assert User.find_by_username_or_email(db_session, "nobody", "none@example.com") is None
+
 def test_user_model_representation(test_user):
     """Test the string representation of User model"""
     expected = f"<User(name={test_user.first_name} {test_user.last_name}, email={test_user.email})>"